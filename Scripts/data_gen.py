@@ -1,9 +1,11 @@
 # ─────────────────────────── scripts/generate_data.py ───────────────────────────
 #!/usr/bin/env python3
-import json, random
+import json
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
+import numpy as np
 import pandas as pd
+import pyarrow as pa, pyarrow.csv as pacsv
 
 CFG = {             # trimmed for brevity – unchanged logic
     "seed": 42, "n_rides": 25_000, "n_drivers": 1_000,
@@ -12,53 +14,79 @@ CFG = {             # trimmed for brevity – unchanged logic
     "surge_prob": 0.30,
     "bbox": {"lat_min": 40.55, "lat_max": 40.92, "lon_min": -74.15, "lon_max": -73.70}
 }
-random.seed(CFG["seed"])
+rng = np.random.default_rng(CFG["seed"])
 
 ROOT      = Path(__file__).resolve().parents[1]
 DATA_DIR  = ROOT / "data";  DATA_DIR.mkdir(exist_ok=True)
 
+def write_csv(df, fp):
+    """Write *df* via Arrow's multithreaded CSV encoder (no index column).
+
+    Header and values are left unquoted to match the pandas-written files;
+    Arrow always quotes its own header, so that line is written here.
+    """
+    tbl  = pa.Table.from_pandas(df, preserve_index=False)
+    # whole-second timestamps regardless of the pandas datetime unit
+    tbl  = tbl.cast(pa.schema([pa.field(f.name, pa.timestamp("s"))
+                               if pa.types.is_timestamp(f.type) else f
+                               for f in tbl.schema]))
+    opts = pacsv.WriteOptions(include_header=False, quoting_style="none")
+    with open(fp, "wb") as fh:
+        fh.write((",".join(df.columns) + "\n").encode())
+        pacsv.write_csv(tbl, fh, opts)
+
 # driver_profiles.csv
-drivers = [
-    {"driver_id": i, "name": f"DRV-{i:04}",
-     "rating": round(random.uniform(4.6, 5.0), 2),
-     "onboard_dt": (datetime(2018, 1, 1) + timedelta(days=random.randint(0, 2555))).date()}
-    for i in range(1, CFG["n_drivers"] + 1)
-]
-pd.DataFrame(drivers).to_csv(DATA_DIR / "driver_profiles.csv", index=False)
+n_drv   = CFG["n_drivers"]
+drv_ids = np.arange(1, n_drv + 1)
+drivers = pd.DataFrame({
+    "driver_id":  drv_ids,
+    "name":       "DRV-" + pd.Series(drv_ids).astype(str).str.zfill(4),
+    "rating":     rng.uniform(4.6, 5.0, size=n_drv).round(2),
+    "onboard_dt": (pd.Timestamp(2018, 1, 1)
+                   + pd.to_timedelta(rng.integers(0, 2556, size=n_drv), unit="D")).date,
+})
+write_csv(drivers, DATA_DIR / "driver_profiles.csv")
 
 # rides.csv
-def pick_coord():
-    lat = random.uniform(CFG["bbox"]["lat_min"], CFG["bbox"]["lat_max"])
-    lon = random.uniform(CFG["bbox"]["lon_min"], CFG["bbox"]["lon_max"])
+n    = CFG["n_rides"]
+bbox = CFG["bbox"]
+
+def pick_coords():
+    lat = rng.uniform(bbox["lat_min"], bbox["lat_max"], size=n)
+    lon = rng.uniform(bbox["lon_min"], bbox["lon_max"], size=n)
     return lat, lon
 
-span = (CFG["end_date"] - CFG["start_date"]).total_seconds()
-rides = []
-for r in range(1, CFG["n_rides"] + 1):
-    ts = CFG["start_date"] + timedelta(seconds=random.randint(0, int(span)))
-    d_id = random.randint(1, CFG["n_drivers"])
-    product = random.choice(CFG["products"])
-    p_lat, p_lon = pick_coord()
-    d_lat, d_lon = pick_coord()
-    dist = round(random.uniform(1, 25), 2)
-    base = 2.5 + dist * 1.75
-    surge = random.random() < CFG["surge_prob"]
-    fare = round(base * (1 + (random.uniform(0.5, 2.0) if surge else 0)), 2)
-    rides.append([r, ts.isoformat(), d_id, product,
-                  p_lat, p_lon, d_lat, d_lon, dist, surge, fare])
-
-cols = ["ride_id","timestamp","driver_id","product",
-        "pickup_lat","pickup_lon","drop_lat","drop_lon",
-        "distance_km","is_surge","fare_usd"]
-pd.DataFrame(rides, columns=cols).to_csv(DATA_DIR / "rides.csv", index=False)
+span    = (CFG["end_date"] - CFG["start_date"]).total_seconds()
+ts_sec  = rng.integers(0, int(span), size=n, endpoint=True)
+d_id    = rng.integers(1, CFG["n_drivers"], size=n, endpoint=True)
+product = rng.choice(CFG["products"], size=n)
+p_lat, p_lon = pick_coords()
+d_lat, d_lon = pick_coords()
+dist  = rng.uniform(1, 25, size=n).round(2)
+surge = rng.random(n) < CFG["surge_prob"]
+mult  = np.where(surge, rng.uniform(0.5, 2.0, size=n), 0.0)
+fare  = ((2.5 + dist * 1.75) * (1 + mult)).round(2)
+
+rides_df = pd.DataFrame({
+    "ride_id":     np.arange(1, n + 1),
+    "timestamp":   pd.Timestamp(CFG["start_date"]) + pd.to_timedelta(ts_sec, unit="s"),
+    "driver_id":   d_id,
+    "product":     product,
+    "pickup_lat":  p_lat, "pickup_lon": p_lon,
+    "drop_lat":    d_lat, "drop_lon":   d_lon,
+    "distance_km": dist,
+    "is_surge":    surge,
+    "fare_usd":    fare,
+})
+write_csv(rides_df, DATA_DIR / "rides.csv")
+rides_df.to_parquet(DATA_DIR / "rides.parquet", compression="snappy", index=False)
 
 # kpi.json
-df = pd.DataFrame(rides, columns=cols)
 kpi = {
-    "total_rides": len(df),
-    "avg_fare_usd": round(df["fare_usd"].mean(), 2),
-    "avg_distance_km": round(df["distance_km"].mean(), 2),
-    "pct_surge": round(100 * df["is_surge"].mean(), 1)
+    "total_rides": len(rides_df),
+    "avg_fare_usd": round(rides_df["fare_usd"].mean(), 2),
+    "avg_distance_km": round(rides_df["distance_km"].mean(), 2),
+    "pct_surge": round(100 * rides_df["is_surge"].mean(), 1)
 }
 (DATA_DIR / "kpi.json").write_text(json.dumps(kpi, indent=2))
 print("✅  Data written to", DATA_DIR.relative_to(ROOT))
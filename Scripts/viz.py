@@ -4,28 +4,70 @@
 viz.py – cleaner NYC-Uber dashboard with new bottom visuals
 """
 
-import json, sys, time
+import json, sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+
+# ── theme / HTML shell ---------------------------------------------------
+TITLE = "NYC Uber Dashboard"
+THEME = {"page_bg":"#f8fafc","header_bg":"#1e293b","accent":"#2563eb","card_bg":"#ffffff"}
+HTML_SHELL = """<!DOCTYPE html><html lang='en'><head>
+<meta charset='utf-8'><title>{title}</title>
+<script src='https://cdn.plot.ly/plotly-2.26.0.min.js'></script>
+<style>
+ body{{margin:0;background:{page_bg};font-family:Segoe UI,Arial,sans-serif;color:#0f172a}}
+ header{{background:{header_bg};color:#fff;padding:1rem 2rem}}
+ h1{{margin:0;font-size:1.8rem;letter-spacing:0.5px}}
+ .grid{{display:grid;grid-template-columns:1fr 1fr;gap:1.5rem;padding:1.5rem}}
+ .card{{background:{card_bg};border-radius:8px;box-shadow:0 2px 6px rgba(0,0,0,.08);padding:1.25rem}}
+ .kpi-grid{{display:grid;grid-template-columns:repeat(auto-fit,minmax(180px,1fr));gap:1rem}}
+ .kpi-card{{background:{accent}1a;border:1px solid {accent}40;
+            border-radius:6px;padding:1.25rem;text-align:center}}
+ .kpi-value{{display:block;font-size:1.6rem;font-weight:600;color:{accent}}}
+ .kpi-label{{display:block;font-size:0.9rem;margin-top:0.25rem;color:#475569}}
+ @media(max-width:900px){{.grid{{grid-template-columns:1fr}}}}
+</style></head><body>
+<header><h1>{title}</h1></header>
+<section class='grid'>
+ {body}
+</section></body></html>"""
 
 # ── paths ----------------------------------------------------------------
 ROOT      = Path(__file__).resolve().parents[1]
 DATA_DIR  = ROOT / "data"
 OUT_DIR   = ROOT / "outputs"; OUT_DIR.mkdir(exist_ok=True)
 
-for fp in (DATA_DIR / "rides.csv", DATA_DIR / "driver_profiles.csv"):
-    if not fp.exists():
-        sys.exit(f"Missing {fp}")
+rides_csv = DATA_DIR / "rides.csv"
+rides_pq  = DATA_DIR / "rides.parquet"      # typed columns, no CSV parse
+for fps in ((rides_csv, rides_pq), (DATA_DIR / "driver_profiles.csv",)):
+    if not any(fp.exists() for fp in fps):
+        sys.exit(f"Missing {fps[0]}")
 
-rides = pd.read_csv(DATA_DIR / "rides.csv", parse_dates=["timestamp"])
+# Parquet only while it is at least as new as the CSV it mirrors
+use_pq = rides_pq.exists() and (not rides_csv.exists() or
+                                rides_pq.stat().st_mtime >= rides_csv.stat().st_mtime)
+
+RIDES_DTYPES = {"ride_id":"int32", "driver_id":"int32", "product":"category",
+                "is_surge":"bool"}
+rides = (pd.read_parquet(rides_pq) if use_pq
+         else pd.read_csv(rides_csv, dtype=RIDES_DTYPES,   # Arrow infers timestamp
+                          engine="pyarrow")
+         ).astype(RIDES_DTYPES)     # same dtypes whichever file was read
 kpi   = json.loads((DATA_DIR / "kpi.json").read_text())
 
+# one colour per product, shared by the map and the box traces
+palette = px.colors.qualitative.Plotly
+PRODUCT_COLORS = {p: palette[i % len(palette)]
+                  for i, p in enumerate(rides["product"].cat.categories)}
+
 # ── FIGURE 1 – map -------------------------------------------------------
 sample = rides.sample(n=min(2_000, len(rides)), random_state=1)
 fig_map = px.scatter_mapbox(
     sample, lat="pickup_lat", lon="pickup_lon",
-    color="product", size="fare_usd",
+    color="product", size="fare_usd", color_discrete_map=PRODUCT_COLORS,
     hover_data={"fare_usd":":.2f","distance_km":True,"is_surge":True},
     zoom=9, height=520
 ).update_layout(mapbox_style="open-street-map",
@@ -33,13 +75,20 @@ fig_map = px.scatter_mapbox(
                 margin=dict(t=40,l=0,r=0,b=0))
 
 # ── FIGURE 2 – fare distribution by product -----------------------------
-fig_box = px.box(
-    rides, x="product", y="fare_usd", color="product",
-    points="outliers", height=520,
-    title="Fare Distribution by Product",
-    labels={"fare_usd":"Fare (USD)", "product":""}
-).update_layout(showlegend=False,
-                margin=dict(t=50,l=40,r=40,b=40))
+# only the five-number summary is shipped, not every ride
+fare_q = (rides.groupby("product", observed=True)["fare_usd"]
+               .quantile([0, .25, .5, .75, 1])
+               .unstack()
+               .round(2))
+fare_q.columns = ["min", "q1", "median", "q3", "max"]
+fig_box = go.Figure([
+    go.Box(x=[prod], name=prod, marker_color=PRODUCT_COLORS[prod],
+           lowerfence=[q["min"]], q1=[q["q1"]], median=[q["median"]],
+           q3=[q["q3"]], upperfence=[q["max"]])
+    for prod, q in fare_q.iterrows()
+]).update_layout(height=520, title="Fare Distribution by Product",
+                 yaxis_title="Fare (USD)", showlegend=False,
+                 margin=dict(t=50,l=40,r=40,b=40))
 
 # ── FIGURE 3 – surge probability by hour --------------------------------
 rides["hour"] = rides["timestamp"].dt.hour
@@ -69,57 +118,60 @@ def plot_div(fig):
     return fig.to_html(full_html=False, include_plotlyjs=False,
                        config={"displayModeBar":True,"displaylogo":False})
 
-cards = [
-    KPI_DIV,
-    f"<div class='card' style='grid-column:span 2'>{plot_div(fig_map)}</div>",
-    f"<div class='card'>{plot_div(fig_box)}</div>",
-    f"<div class='card'>{plot_div(fig_line)}</div>",
+# (figure, spans both grid columns) – serialised concurrently
+figs = [(fig_map, True), (fig_box, False), (fig_line, False)]
+with ThreadPoolExecutor(max_workers=len(figs)) as ex:
+    divs = list(ex.map(plot_div, [f for f, _ in figs]))
+
+cards = [KPI_DIV] + [
+    f"<div class='card' style='grid-column:span 2'>{d}</div>" if full
+    else f"<div class='card'>{d}</div>"
+    for d, (_, full) in zip(divs, figs)
 ]
 
-# ── theme / HTML shell ---------------------------------------------------
-THEME = {"page_bg":"#f8fafc","header_bg":"#1e293b","accent":"#2563eb","card_bg":"#ffffff"}
-html = f"""<!DOCTYPE html><html lang='en'><head>
-<meta charset='utf-8'><title>NYC Uber Dashboard</title>
-<script src='https://cdn.plot.ly/plotly-2.26.0.min.js'></script>
-<style>
- body{{margin:0;background:{THEME['page_bg']};font-family:Segoe UI,Arial,sans-serif;color:#0f172a}}
- header{{background:{THEME['header_bg']};color:#fff;padding:1rem 2rem}}
- h1{{margin:0;font-size:1.8rem;letter-spacing:0.5px}}
- .grid{{display:grid;grid-template-columns:1fr 1fr;gap:1.5rem;padding:1.5rem}}
- .card{{background:{THEME['card_bg']};border-radius:8px;box-shadow:0 2px 6px rgba(0,0,0,.08);padding:1.25rem}}
- .kpi-grid{{display:grid;grid-template-columns:repeat(auto-fit,minmax(180px,1fr));gap:1rem}}
- .kpi-card{{background:{THEME['accent']}1a;border:1px solid {THEME['accent']}40;
-            border-radius:6px;padding:1.25rem;text-align:center}}
- .kpi-value{{display:block;font-size:1.6rem;font-weight:600;color:{THEME['accent']}}}
- .kpi-label{{display:block;font-size:0.9rem;margin-top:0.25rem;color:#475569}}
- @media(max-width:900px){{.grid{{grid-template-columns:1fr}}}}
-</style></head><body>
-<header><h1>NYC Uber Dashboard</h1></header>
-<section class='grid'>
- {''.join(cards)}
-</section></body></html>"""
+# ── render ---------------------------------------------------------------
+html = HTML_SHELL.format(title=TITLE, body="".join(cards), **THEME)
 
 out = OUT_DIR / "uber_dashboard.html"
 out.write_text(html, encoding="utf-8")
 print("✓", out.relative_to(ROOT))
 
-# optional PNG (same as before) ------------------------------------------
+# optional PNG – one static image via kaleido, no browser ---------------
+def png_figure(with_map=True):
+    """Combine the dashboard figures into one subplot figure for kaleido."""
+    from plotly.subplots import make_subplots
+    panels = figs if with_map else figs[1:]
+    specs  = ([[{"type":"mapbox","colspan":2}, None], [{}, {}]] if with_map
+              else [[{}, {}]])
+    row    = len(specs)                    # box + line share the last row
+    combo = make_subplots(
+        rows=row, cols=2, vertical_spacing=0.08, specs=specs,
+        subplot_titles=[f.layout.title.text for f, _ in panels])
+    if with_map:
+        combo.add_traces(fig_map.data, rows=1, cols=1)
+        combo.update_layout(mapbox_style="open-street-map", mapbox_zoom=9,
+                            mapbox_center=fig_map.layout.mapbox.center)
+    combo.add_traces(fig_box.data, rows=row, cols=1)
+    combo.add_traces(fig_line.data, rows=row, cols=2)
+    combo.update_traces(showlegend=False, selector=dict(type="box"))
+    combo.update_layout(title=TITLE, margin=dict(t=80,l=40,r=40,b=40))
+    combo.update_yaxes(title_text="Fare (USD)", row=row, col=1)
+    combo.update_xaxes(title_text="Hour of day", row=row, col=2)
+    combo.update_yaxes(title_text="Surge rides (%)", row=row, col=2)
+    return combo, (900 if with_map else 520)
+
 if "--png" in sys.argv:
-    try:
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
-        opts = Options(); opts.add_argument("--headless=new")
-        opts.add_argument("--window-size=1600,900")
-        drv = webdriver.Chrome(options=opts)
-        drv.get("file://" + out.resolve().as_posix())
-        time.sleep(2)
-        h = drv.execute_script("return document.body.scrollHeight")
-        drv.set_window_size(1600, h)
-        png = OUT_DIR / "uber_dashboard.png"
-        drv.save_screenshot(str(png)); drv.quit()
-        print("✓", png.relative_to(ROOT))
-    except Exception as e:
-        print("⚠ PNG not created:", e)
+    png = OUT_DIR / "uber_dashboard.png"
+    # kaleido's mapbox renderer can fail (no WebGL / tiles) – keep the charts
+    for with_map in (True, False):
+        try:
+            combo, h = png_figure(with_map)
+            combo.write_image(png, width=1600, height=h)
+            print("✓", png.relative_to(ROOT))
+            break
+        except Exception as e:
+            print("⚠ PNG map panel failed, retrying without it:" if with_map
+                  else "⚠ PNG not created:", e)
 
 if __name__ == "__main__" and "--no-browser" not in sys.argv:
     import webbrowser; webbrowser.open(out.as_uri())